@@ -0,0 +1,97 @@
+"""
+Meet het geheugengebruik per rij van de zontijden.
+
+Vergelijkt een Zondag met de eerdere dictionary met vier strings per dag.
+
+Gebruik: python benchzondag.py [aantal]
+"""
+import datetime
+import sys
+import tracemalloc
+
+import pytz
+
+from zonnetijden import berekenzonnetijden, formattimedelta, getinfo
+
+
+def formatdate(date: datetime) -> str:
+  """
+  Converteert een datetime object naar een datum string.
+
+  Args:
+      date: datetime object dat geformatteerd moet worden
+
+  Returns:
+      str: Geformatteerde datum in YYYY-MM-DD formaat
+  """
+  localdate = date.astimezone(pytz.timezone('Europe/Amsterdam'))
+  return datetime.datetime.strftime(localdate, '%Y-%m-%d')
+
+
+def formattime(date: datetime, seconds: bool = False) -> str:
+  """
+  Converteert een datetime object naar een tijd string.
+
+  Args:
+      date: datetime object dat geformatteerd moet worden
+      seconds: Of seconden meegenomen moeten worden in de output
+
+  Returns:
+      str: Geformatteerde tijd in HH:MM- of HH:MM:SS-formaat
+  """
+  localdate = date.astimezone(pytz.timezone('Europe/Amsterdam'))
+  if seconds:
+    formaat = '%H:%M:%S'
+  else:
+    formaat = '%H:%M'
+  return datetime.datetime.strftime(localdate, formaat)
+
+
+def alsdictionary(datum: str, lat: float, lon: float) -> dict:
+  """
+  Maakt een rij als dictionary met strings, zoals getinfo dat eerder deed.
+
+  Args:
+      datum: Datum waarvoor de rij gemaakt wordt
+      lat: Breedtegraad van de locatie
+      lon: Lengtegraad van de locatie
+
+  Returns:
+      dict: Dictionary met datum, zonsopkomst, -ondergang en daglengte
+  """
+  res = berekenzonnetijden(datum, 'Bench', lat, lon)
+  opkomst = res['sunrise']
+  onder = res['sunset']
+  return {'datum': formatdate(opkomst),
+          'op': formattime(opkomst, True),
+          'onder': formattime(onder, True),
+          'daglengte': formattimedelta(onder - opkomst)}
+
+
+def meet(maakrij, aantal: int) -> float:
+  """
+  Meet het gemiddelde aantal bytes per bewaarde rij.
+
+  Args:
+      maakrij: Functie die voor een datum één rij maakt
+      aantal: Aantal rijen
+
+  Returns:
+      float: Gemiddeld aantal bytes per rij
+  """
+  vandaag = datetime.date.today()
+  tracemalloc.start()
+  start = tracemalloc.take_snapshot()
+  rijen = [maakrij(str(vandaag + datetime.timedelta(i))) for i in range(aantal)]
+  totaal = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(start, 'filename'))
+  tracemalloc.stop()
+  del rijen
+  return totaal / aantal
+
+
+if __name__ == '__main__':
+  argaantal = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+  oud = meet(lambda datum: alsdictionary(datum, 52.479108, 6.060676), argaantal)
+  nieuw = meet(lambda datum: getinfo(datum, 'Bench', 52.479108, 6.060676, True), argaantal)
+  print(f'dictionary: {oud:.0f} bytes per rij')
+  print(f'Zondag:     {nieuw:.0f} bytes per rij')
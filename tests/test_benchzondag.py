@@ -0,0 +1,43 @@
+import datetime
+
+import pytest
+import pytz
+
+tzams = pytz.timezone('Europe/Amsterdam')
+
+
+@pytest.fixture
+def mock_env_weerapikey(monkeypatch):
+  monkeypatch.setenv("WEER_API_KEY", "DUMMY")
+
+
+def test_formatdate(mock_env_weerapikey):
+  import benchzondag
+
+  invoer = datetime.datetime(2024, 12, 7, 19, 2, 37, tzinfo=tzams)
+  uitvoer = benchzondag.formatdate(invoer)
+  assert uitvoer == '2024-12-07'
+
+
+def test_formattime(mock_env_weerapikey):
+  import benchzondag
+
+  invoer = datetime.datetime(2024, 12, 7, 19, 2, 37, tzinfo=tzams)
+  uitvoer = benchzondag.formattime(invoer)
+  assert uitvoer == '19:02'
+
+
+def test_formattimeseconds(mock_env_weerapikey):
+  import benchzondag
+
+  invoer = datetime.datetime(2024, 12, 7, 19, 2, 37, tzinfo=tzams)
+  uitvoer = benchzondag.formattime(invoer, True)
+  assert uitvoer == '19:02:37'
+
+
+def test_benchzondag(mock_env_weerapikey):
+  import benchzondag
+
+  rij = benchzondag.alsdictionary('2024-12-21', 52.479108, 6.060676)
+  assert rij == {'daglengte': '7:38:43', 'datum': '2024-12-21', 'onder': '16:23:26', 'op': '08:44:42'}
+  assert benchzondag.meet(lambda datum: benchzondag.alsdictionary(datum, 52.479108, 6.060676), 10) > 0
@@ -33,6 +33,11 @@ def app():
     import zonnetijden
     return zonnetijden.zonget()
 
+  @app.route('/teller', methods=['GET'])
+  def teller():
+    import zonnetijden
+    return zonnetijden.tellerget()
+
   yield app
 
 
@@ -45,7 +50,7 @@ def client(app):
 def clear_cache():
   import zonnetijden
   yield
-  zonnetijden.getwaterinfo.cache_clear()
+  zonnetijden.haalwaterinfo.cache_clear()
 
 
 @freeze_time("2024-12-23 13:28:00")
@@ -164,3 +169,41 @@ def test_zon_fout_in_plaats(mock_env_weerapikey, client):
   assert b'<td>2024-12-13</td>' in response.data
   assert b'<td>2025-02-10</td>' in response.data
   assert b'<td>2025-02-11</td>' not in response.data
+
+
+@freeze_time("2024-12-23 13:28:00")
+def test_zon_te_groot(mock_env_weerapikey, client):
+  response = client.get('/zon?vooruit=10000000')
+  assert response.status_code == 413
+  assert b'maximaal 1000 dagen' in response.data
+  assert b'<td>' not in response.data
+
+
+@freeze_time("2024-12-23 13:28:00")
+def test_zon_tegoed_op_en_teller(mock_env_weerapikey, client):
+  import zonnetijden
+  from toelating import Toelating
+  toelating = Toelating(maxkosten=100, capaciteit=10, aanvulling=0.01, duurgrens=100, maxduur=1)
+  with patch.object(zonnetijden, 'zontoelating', toelating):
+    assert client.get('/zon?terug=0&vooruit=5').status_code == 200
+    assert client.get('/zon?terug=0&vooruit=5').status_code == 200
+    response = client.get('/zon?terug=0&vooruit=5')
+    assert response.status_code == 429
+    assert response.headers['Retry-After'] == '500'
+    assert b'Te veel aanvragen' in response.data
+    teller = client.get('/teller').get_json()
+  assert teller == {'toegelaten': 2, 'tegoed_op': 1}
+
+
+@freeze_time("2024-12-23 13:28:00")
+def test_zon_te_druk(mock_env_weerapikey, client):
+  import zonnetijden
+  from toelating import Toelating
+  toelating = Toelating(maxkosten=100, capaciteit=100, aanvulling=1, duurgrens=5, maxduur=1)
+  toelating.toelaten('andere client', 5)
+  with patch.object(zonnetijden, 'zontoelating', toelating):
+    response = client.get('/zon?terug=0&vooruit=5')
+  assert response.status_code == 429
+  assert response.headers['Retry-After'] == '1'
+  assert b'Te veel grote aanvragen tegelijk' in response.data
+  assert toelating.teller['te_druk'] == 1
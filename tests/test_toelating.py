@@ -0,0 +1,47 @@
+from freezegun import freeze_time
+
+from toelating import Toelating, Tokenemmer, TOEGELATEN, TE_GROOT, TEGOED_OP, TE_DRUK
+
+
+def nieuwetoelating():
+  return Toelating(maxkosten=100, capaciteit=150, aanvulling=10, duurgrens=50, maxduur=1)
+
+
+def test_tokenemmer():
+  with freeze_time("2024-12-23 13:28:00") as klok:
+    emmer = Tokenemmer(10, 1)
+    assert emmer.neem(8)
+    assert not emmer.neem(5)
+    klok.tick(3)
+    assert emmer.neem(5)
+    klok.tick(100)
+    assert not emmer.neem(11)
+    assert emmer.neem(4)
+    assert emmer.wachttijd(10) == 4
+
+
+def test_toelating_te_groot():
+  toelating = nieuwetoelating()
+  assert toelating.toelaten('a', 101) == (TE_GROOT, 0)
+  assert toelating.teller['te_groot'] == 1
+
+
+def test_toelating_tegoed_op():
+  toelating = nieuwetoelating()
+  assert toelating.toelaten('a', 40) == (TOEGELATEN, 0)
+  assert toelating.toelaten('a', 40) == (TOEGELATEN, 0)
+  assert toelating.toelaten('a', 40) == (TOEGELATEN, 0)
+  assert toelating.toelaten('a', 40) == (TEGOED_OP, 1)
+  assert toelating.toelaten('b', 40) == (TOEGELATEN, 0)
+  assert toelating.teller['toegelaten'] == 4
+  assert toelating.teller['tegoed_op'] == 1
+
+
+def test_toelating_te_druk():
+  toelating = nieuwetoelating()
+  assert toelating.toelaten('a', 60) == (TOEGELATEN, 0)
+  assert toelating.toelaten('b', 60) == (TE_DRUK, 1)
+  assert toelating.toelaten('b', 10) == (TOEGELATEN, 0)
+  toelating.vrijgeven(60)
+  assert toelating.toelaten('b', 60) == (TOEGELATEN, 0)
+  assert toelating.teller['te_druk'] == 1
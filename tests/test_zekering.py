@@ -0,0 +1,68 @@
+import pytest
+from freezegun import freeze_time
+
+from zekering import DICHT, OPEN, Onderbroken, Zekering
+
+
+def test_zekering_springt():
+  zekering = Zekering(budget=1.0, drempel=2, hersteltijd=60)
+  assert zekering.toegestaan()
+  zekering.registreer(False, 0.1)
+  assert zekering.toegestaan()
+  zekering.registreer(False, 0.1)
+  assert not zekering.toegestaan()
+
+
+def test_zekering_traag_telt_als_fout():
+  zekering = Zekering(budget=1.0, drempel=1)
+  zekering.registreer(True, 2.5)
+  assert not zekering.toegestaan()
+
+
+def test_zekering_succes_reset():
+  zekering = Zekering(budget=1.0, drempel=2)
+  zekering.registreer(False, 0.1)
+  zekering.registreer(True, 0.1)
+  zekering.registreer(False, 0.1)
+  assert zekering.toegestaan()
+
+
+def test_zekering_halfopen():
+  with freeze_time("2024-12-23 13:28:00") as klok:
+    zekering = Zekering(budget=1.0, drempel=1, hersteltijd=60)
+    zekering.registreer(False, 0.1)
+    assert not zekering.toegestaan()
+    klok.tick(61)
+    assert zekering.toegestaan()
+    assert not zekering.toegestaan()
+    zekering.registreer(False, 0.1)
+    assert not zekering.toegestaan()
+    klok.tick(61)
+    assert zekering.toegestaan()
+    zekering.registreer(True, 0.1)
+    assert zekering.toegestaan()
+    assert zekering.toegestaan()
+
+
+def test_zekering_aanroep_fout_halfopen():
+  def fout():
+    raise ValueError('ongeldige tijd')
+
+  with freeze_time("2024-12-23 13:28:00") as klok:
+    zekering = Zekering(budget=1.0, drempel=1, hersteltijd=60)
+    with pytest.raises(Onderbroken):
+      zekering.aanroep(fout)
+    klok.tick(61)
+    with pytest.raises(Onderbroken):
+      zekering.aanroep(fout)
+    assert zekering.toestand == OPEN
+    klok.tick(61)
+    assert zekering.aanroep(lambda: {'a': 1}) == {'a': 1}
+    assert zekering.toestand == DICHT
+
+
+def test_zekering_aanroep_open():
+  zekering = Zekering(budget=1.0, drempel=1)
+  zekering.registreer(False, 0.1)
+  with pytest.raises(Onderbroken):
+    zekering.aanroep(lambda: {})
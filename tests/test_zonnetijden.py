@@ -1,4 +1,6 @@
 import datetime
+import time
+from unittest.mock import patch
 
 import pytest
 import pytz
@@ -11,30 +13,6 @@ def mock_env_weerapikey(monkeypatch):
   monkeypatch.setenv("WEER_API_KEY", "DUMMY")
 
 
-def test_formatdate(mock_env_weerapikey):
-  import zonnetijden
-
-  invoer = datetime.datetime(2024, 12, 7, 19, 2, 37, tzinfo=tzams)
-  uitvoer = zonnetijden.formatdate(invoer)
-  assert uitvoer == '2024-12-07'
-
-
-def test_formattime(mock_env_weerapikey):
-  import zonnetijden
-
-  invoer = datetime.datetime(2024, 12, 7, 19, 2, 37, tzinfo=tzams)
-  uitvoer = zonnetijden.formattime(invoer)
-  assert uitvoer == '19:02'
-
-
-def test_formattimeseconds(mock_env_weerapikey):
-  import zonnetijden
-
-  invoer = datetime.datetime(2024, 12, 7, 19, 2, 37, tzinfo=tzams)
-  uitvoer = zonnetijden.formattime(invoer, True)
-  assert uitvoer == '19:02:37'
-
-
 def test_formattimedelta(mock_env_weerapikey):
   import zonnetijden
 
@@ -49,7 +27,29 @@ def test_berekenzonnetijden():
 
   verwachting = {'daglengte': '7:38:43', 'datum': '2024-12-21', 'onder': '16:23', 'op': '08:44'}
   resultaat = zonnetijden.getinfohattem('2024-12-21')
-  assert resultaat == verwachting
+  assert resultaat.alsdict() == verwachting
+
+
+def test_zondag(mock_env_weerapikey):
+  import zonnetijden
+
+  opkomst = datetime.datetime(2024, 12, 7, 8, 32, 11, 700000, tzinfo=pytz.utc).astimezone(tzams)
+  onder = datetime.datetime(2024, 12, 7, 16, 21, 43, 200000, tzinfo=pytz.utc)
+  zondag = zonnetijden.Zondag(opkomst, onder, True)
+  assert zondag['datum'] == '2024-12-07'
+  assert zondag['op'] == '09:32:11'
+  assert zondag['onder'] == '17:21:43'
+  assert zondag['daglengte'] == '7:49:31'
+  assert zonnetijden.Zondag(opkomst, onder)['op'] == '09:32'
+  with pytest.raises(KeyError):
+    zondag['alsdict']
+
+
+def test_formatseconden(mock_env_weerapikey):
+  import zonnetijden
+
+  assert zonnetijden.formatseconden(68557.9) == '19:02'
+  assert zonnetijden.formatseconden(68557.9, True) == '19:02:37'
 
 
 def test_bepaaltoenamekleur():
@@ -95,3 +95,104 @@ def test_locatieinfo():
   resultzwolle = {'lat': 52.51868565, 'lon': 6.11836361}
   assert zonnetijden.getlocatieinfo('Zwolle') == resultzwolle
   assert zonnetijden.getlocatieinfo('123456') == {}
+
+
+@patch('requests.get')
+def test_leesjson_zekering_open(mock_get, mock_env_weerapikey):
+  import zonnetijden
+  from zekering import Onderbroken, Zekering
+  zekering = Zekering(budget=1.0, drempel=1)
+  zekering.registreer(False, 0.1)
+  with pytest.raises(Onderbroken):
+    zonnetijden.leesjson('https://example.com', zekering)
+  assert not mock_get.called
+
+
+@patch('waterstand.haalwaterstand', side_effect=ValueError('ongeldige tijd'))
+def test_waterinfo_fout(mock_waterstand, mock_env_weerapikey):
+  import zonnetijden
+  from zekering import Zekering, OPEN
+  zekering = Zekering(budget=1.0, drempel=1)
+  with patch.object(zonnetijden, 'waterzekering', zekering):
+    zonnetijden.haalwaterinfo.cache_clear()
+    assert zonnetijden.getwaterinfo() == {}
+  zonnetijden.haalwaterinfo.cache_clear()
+  assert mock_waterstand.called
+  assert zekering.toestand == OPEN
+
+
+@patch('waterstand.haalwaterstand', side_effect=lambda plaats: time.sleep(1))
+def test_waterinfo_budget(mock_waterstand, mock_env_weerapikey):
+  import zonnetijden
+  from zekering import Zekering
+  zekering = Zekering(budget=0.1, drempel=3)
+  with patch.object(zonnetijden, 'waterzekering', zekering):
+    zonnetijden.haalwaterinfo.cache_clear()
+    start = time.monotonic()
+    assert zonnetijden.getwaterinfo() == {}
+    assert time.monotonic() - start < 0.5
+    assert zonnetijden.waterbezig()
+    assert zonnetijden.getwaterinfo() == {}
+  assert mock_waterstand.call_count == 1
+  assert zekering.fouten == 1
+  zonnetijden.waterlopend[0].result()
+  assert not zonnetijden.waterbezig()
+  zonnetijden.haalwaterinfo.cache_clear()
+
+
+@patch('waterstand.haalwaterstand')
+def test_waterinfo_fout_niet_gecachet(mock_waterstand, mock_env_weerapikey):
+  import zonnetijden
+  from zekering import Onderbroken, Zekering
+  zonnetijden.haalwaterinfo.cache_clear()
+  with patch.object(zonnetijden, 'waterzekering', Zekering(budget=1.0)):
+    mock_waterstand.return_value = {'resultaat': 'NOK', 'error': 'storing bij RWS'}
+    with pytest.raises(Onderbroken, match='storing bij RWS'):
+      zonnetijden.haalwaterinfo()
+    assert zonnetijden.getwaterinfo() == {}
+    mock_waterstand.return_value = {'resultaat': 'OK', 'nu': 84.0, 'morgen': 89.0}
+    assert zonnetijden.getwaterinfo() == {'hoogtenu': 84, 'hoogtemorgen': 89}
+  zonnetijden.haalwaterinfo.cache_clear()
+
+
+@patch('requests.get')
+def test_weerinfo_zekering_open(mock_get, mock_env_weerapikey):
+  import zonnetijden
+  from zekering import Zekering
+  zekering = Zekering(budget=1.0, drempel=1)
+  zekering.registreer(False, 0.1)
+  zonnetijden.haalweerinfo.cache_clear()
+  with patch.object(zonnetijden, 'weerzekering', zekering):
+    assert zonnetijden.getweerinfo() == {}
+  assert not mock_get.called
+  assert len(zonnetijden.weercache) == 0
+
+
+@patch('waterstand.haalwaterstand')
+def test_waterinfo_zekering_open(mock_waterstand, mock_env_weerapikey):
+  import zonnetijden
+  from zekering import Zekering
+  zekering = Zekering(budget=1.0, drempel=1)
+  zekering.registreer(False, 0.1)
+  zonnetijden.haalwaterinfo.cache_clear()
+  with patch.object(zonnetijden, 'waterzekering', zekering):
+    assert zonnetijden.getwaterinfo() == {}
+  assert not mock_waterstand.called
+  assert len(zonnetijden.watercache) == 0
+
+
+@patch('requests.get')
+def test_locatieinfo_foutstatus(mock_get, mock_env_weerapikey):
+  import requests
+  import zonnetijden
+  from zekering import Zekering
+  antwoord = requests.models.Response()
+  antwoord.status_code = 503
+  antwoord._content = b'{"error": "onderhoud"}'
+  mock_get.return_value = antwoord
+  zekering = Zekering(budget=1.0)
+  zonnetijden.haallocatieinfo.cache_clear()
+  with patch.object(zonnetijden, 'locatiezekering', zekering):
+    assert zonnetijden.getlocatieinfo('Zwolle') == {}
+  assert zekering.fouten == 1
+  assert len(zonnetijden.locatiecache) == 0
@@ -0,0 +1,65 @@
+import datetime
+from unittest.mock import patch
+
+from astral import Observer
+from astral.sun import sunrise, sunset
+
+import zonraster
+
+
+def test_binnenraster():
+  zonraster.bouwrasters([2024])
+  assert zonraster.binnenraster('2024-12-21', 52.479108, 6.060676)
+  assert not zonraster.binnenraster('2024-12-21', 48.85, 2.35)
+  assert not zonraster.binnenraster('2099-12-21', 52.479108, 6.060676)
+
+
+def test_zontijden():
+  zonraster.bouwrasters([2024, 2025])
+  for datum, lat, lon in [('2024-12-21', 52.479108, 6.060676),
+                          ('2024-06-21', 53.2, 5.8),
+                          ('2025-03-20', 51.44, 3.57),
+                          ('2024-12-31', zonraster.NOORD, zonraster.OOST)]:
+    opkomst, onder = zonraster.zontijden(datum, lat, lon)
+    observer = Observer(lat, lon)
+    dag = datetime.date.fromisoformat(datum)
+    assert abs((opkomst - sunrise(observer, dag)).total_seconds()) < zonraster.MAXFOUT
+    assert abs((onder - sunset(observer, dag)).total_seconds()) < zonraster.MAXFOUT
+
+
+def test_valideer(monkeypatch):
+  monkeypatch.setenv("WEER_API_KEY", "DUMMY")
+  import valideerraster
+  assert valideerraster.valideer(2024, 50) < zonraster.MAXFOUT
+
+
+def seconden(daglengte):
+  uren, minuten, secs = daglengte.split(':')
+  return int(uren) * 3600 + int(minuten) * 60 + int(secs)
+
+
+def test_getinfo_snelzon(monkeypatch):
+  monkeypatch.setenv("WEER_API_KEY", "DUMMY")
+  import zonnetijden
+  zonraster.bouwrasters([2024, 2025])
+  for datum, plaats, lat, lon in [('2024-12-21', 'Hattem', 52.479108, 6.060676),
+                                  ('2024-06-21', 'Leeuwarden', 53.2, 5.8),
+                                  ('2025-03-30', 'Vlissingen', 51.44, 3.57),
+                                  ('2025-10-26', 'Enschede', 52.22, 6.89)]:
+    verwachting = zonnetijden.getinfo(datum, plaats, lat, lon).alsdict()
+    monkeypatch.setattr(zonnetijden, 'snelzon', True)
+    resultaat = zonnetijden.getinfo(datum, plaats, lat, lon).alsdict()
+    for veld in ('datum', 'op', 'onder'):
+      assert resultaat[veld] == verwachting[veld]
+    assert abs(seconden(resultaat['daglengte']) - seconden(verwachting['daglengte'])) < zonraster.MAXFOUT
+    monkeypatch.setattr(zonnetijden, 'snelzon', False)
+
+
+def test_getinfo_snelzon_buiten_jaren(monkeypatch):
+  monkeypatch.setenv("WEER_API_KEY", "DUMMY")
+  import zonnetijden
+  verwachting = zonnetijden.getinfo('2099-06-21', 'Hattem', 52.479108, 6.060676).alsdict()
+  monkeypatch.setattr(zonnetijden, 'snelzon', True)
+  with patch('zonraster.bouwraster') as mock_bouwraster:
+    assert zonnetijden.getinfo('2099-06-21', 'Hattem', 52.479108, 6.060676).alsdict() == verwachting
+  assert not mock_bouwraster.called
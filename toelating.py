@@ -0,0 +1,157 @@
+"""
+Module voor toelatingscontrole op basis van de kosten van een aanvraag.
+
+De kosten van een aanvraag zijn het aantal te berekenen rijen maal het aantal
+locaties. Een aanvraag wordt geweigerd als:
+- de kosten boven het maximum per aanvraag liggen (413)
+- het tegoed van de client op is (429)
+- er al te veel dure aanvragen tegelijk lopen (429)
+Alle uitkomsten worden bijgehouden in tellers met de reden als sleutel.
+"""
+import math
+import threading
+import time
+from collections import Counter
+
+from cachetools import TTLCache
+
+TOEGELATEN = 'toegelaten'
+TE_GROOT = 'te_groot'
+TEGOED_OP = 'tegoed_op'
+TE_DRUK = 'te_druk'
+
+
+class Tokenemmer:
+  """
+  Token bucket met een maximaal tegoed dat per seconde aangevuld wordt.
+
+  Args:
+      capaciteit: Maximaal tegoed van de emmer
+      aanvulling: Aantal tokens dat per seconde bijkomt
+  """
+
+  def __init__(self, capaciteit: float, aanvulling: float):
+    self.capaciteit = capaciteit
+    self.aanvulling = aanvulling
+    self.tegoed = capaciteit
+    self.bijgewerkt = time.monotonic()
+
+  def neem(self, aantal: float) -> bool:
+    """
+    Neemt tokens uit de emmer als er genoeg tegoed is.
+
+    Args:
+        aantal: Aantal benodigde tokens
+
+    Returns:
+        bool: True als de tokens genomen zijn, False als het tegoed te laag is
+    """
+    nu = time.monotonic()
+    self.tegoed = min(self.capaciteit, self.tegoed + (nu - self.bijgewerkt) * self.aanvulling)
+    self.bijgewerkt = nu
+    if aantal > self.tegoed:
+      return False
+    self.tegoed -= aantal
+    return True
+
+  def teruggeven(self, aantal: float) -> None:
+    """
+    Geeft eerder genomen tokens terug aan de emmer.
+
+    Args:
+        aantal: Aantal terug te geven tokens
+    """
+    self.tegoed = min(self.capaciteit, self.tegoed + aantal)
+
+  def wachttijd(self, aantal: float) -> int:
+    """
+    Bepaalt na hoeveel seconden er genoeg tegoed is voor een aantal tokens.
+
+    Args:
+        aantal: Aantal benodigde tokens
+
+    Returns:
+        int: Aantal seconden, naar boven afgerond en minimaal 1
+    """
+    return max(1, math.ceil((aantal - self.tegoed) / self.aanvulling))
+
+
+class Toelating:
+  """
+  Toelatingscontrole met een kostenmaximum, tegoed per client en een limiet op dure aanvragen.
+
+  Args:
+      maxkosten: Maximale kosten van één aanvraag
+      capaciteit: Maximaal tegoed per client
+      aanvulling: Aanvulling van het tegoed per client per seconde
+      duurgrens: Kosten vanaf waar een aanvraag als duur geldt
+      maxduur: Maximaal aantal dure aanvragen dat tegelijk uitgevoerd wordt
+  """
+
+  def __init__(self, maxkosten: int, capaciteit: float, aanvulling: float,
+               duurgrens: int, maxduur: int):
+    self.maxkosten = maxkosten
+    self.emmerinstelling = (capaciteit, aanvulling)
+    self.duurgrens = duurgrens
+    self.duurvrij = maxduur
+    self.emmers = TTLCache(maxsize=1024, ttl=3600)
+    self.teller = Counter()
+    self.slot = threading.Lock()
+
+  def toelaten(self, client: str, kosten: int) -> tuple[str, int]:
+    """
+    Bepaalt of een aanvraag uitgevoerd mag worden.
+
+    Na een toegelaten aanvraag moet altijd vrijgeven() aangeroepen worden.
+
+    Args:
+        client: Identificatie van de client, bijvoorbeeld het IP-adres
+        kosten: Kosten van de aanvraag
+
+    Returns:
+        tuple: De reden (TOEGELATEN, TE_GROOT, TEGOED_OP of TE_DRUK) en het aantal
+        seconden waarna een nieuwe poging zin heeft (0 als dat niet van toepassing is)
+    """
+    with self.slot:
+      reden, wachttijd = self.beoordeel(client, kosten)
+      self.teller[reden] += 1
+      return reden, wachttijd
+
+  def beoordeel(self, client: str, kosten: int) -> tuple[str, int]:
+    """
+    Beoordeelt een aanvraag en neemt het tegoed en de plek als die toegelaten wordt.
+
+    Moet aangeroepen worden terwijl het slot vastgehouden wordt.
+
+    Args:
+        client: Identificatie van de client
+        kosten: Kosten van de aanvraag
+
+    Returns:
+        tuple: De reden en het aantal seconden tot een nieuwe poging
+    """
+    if kosten > self.maxkosten:
+      return TE_GROOT, 0
+    emmer = self.emmers.get(client)
+    if emmer is None:
+      emmer = Tokenemmer(*self.emmerinstelling)
+      self.emmers[client] = emmer
+    if not emmer.neem(kosten):
+      return TEGOED_OP, emmer.wachttijd(kosten)
+    if kosten >= self.duurgrens:
+      if self.duurvrij == 0:
+        emmer.teruggeven(kosten)
+        return TE_DRUK, 1
+      self.duurvrij -= 1
+    return TOEGELATEN, 0
+
+  def vrijgeven(self, kosten: int) -> None:
+    """
+    Geeft de plek van een dure aanvraag weer vrij.
+
+    Args:
+        kosten: Kosten van de afgeronde aanvraag
+    """
+    if kosten >= self.duurgrens:
+      with self.slot:
+        self.duurvrij += 1
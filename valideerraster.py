@@ -0,0 +1,46 @@
+"""
+Meet de fout van het zonraster ten opzichte van berekenzonnetijden.
+
+Gebruik: python valideerraster.py [jaar] [aantal]
+"""
+import datetime
+import random
+import sys
+
+import zonraster
+from zonnetijden import berekenzonnetijden
+
+
+def valideer(jaar: int, aantal: int) -> float:
+  """
+  Vergelijkt het raster met berekenzonnetijden voor willekeurige locaties en dagen.
+
+  Args:
+      jaar: Het jaar waarin de dagen gekozen worden
+      aantal: Aantal willekeurige combinaties van locatie en dag
+
+  Returns:
+      float: De grootste gevonden afwijking in seconden
+  """
+  zonraster.bouwrasters([jaar])
+  eerstedag = datetime.date(jaar, 1, 1)
+  dagen = (datetime.date(jaar + 1, 1, 1) - eerstedag).days
+  maxfout = 0.0
+  for _ in range(aantal):
+    lat = random.uniform(zonraster.ZUID, zonraster.NOORD)
+    lon = random.uniform(zonraster.WEST, zonraster.OOST)
+    datum = str(eerstedag + datetime.timedelta(random.randrange(dagen)))
+    opkomst, onder = zonraster.zontijden(datum, lat, lon)
+    res = berekenzonnetijden(datum, 'Validatie', lat, lon)
+    maxfout = max(maxfout,
+                  abs((opkomst - res['sunrise']).total_seconds()),
+                  abs((onder - res['sunset']).total_seconds()))
+  return maxfout
+
+
+if __name__ == '__main__':
+  argjaar = int(sys.argv[1]) if len(sys.argv) > 1 else datetime.date.today().year
+  argaantal = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+  fout = valideer(argjaar, argaantal)
+  print(f'Grootste afwijking in {argjaar} over {argaantal} punten: {fout:.2f} seconden '
+        f'(maximum {zonraster.MAXFOUT})')
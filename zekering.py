@@ -0,0 +1,99 @@
+"""
+Module met een zekering (circuit breaker) voor aanroepen naar externe bronnen.
+
+Een zekering telt mislukte en trage aanroepen. Na een aantal opeenvolgende
+fouten 'springt' de zekering (open) en worden aanroepen direct geweigerd,
+zodat de aanroeper meteen de bestaande terugvalwaarde kan gebruiken. Na de
+hersteltijd laat de zekering één proefaanroep door (half-open); slaagt die,
+dan sluit de zekering weer.
+"""
+import threading
+import time
+from collections.abc import Callable
+
+DICHT = 'dicht'
+OPEN = 'open'
+HALFOPEN = 'halfopen'
+
+
+class Onderbroken(Exception):
+  """ Een aanroep is niet uitgevoerd of mislukt; de aanroeper valt terug """
+
+
+class Zekering:
+  """
+  Circuit breaker voor één externe bron met een eigen tijdsbudget.
+
+  Args:
+      budget: Maximale duur van een aanroep in seconden; tragere aanroepen tellen als fout
+      drempel: Aantal opeenvolgende fouten waarna de zekering springt
+      hersteltijd: Aantal seconden dat de zekering open blijft voor een proefaanroep
+  """
+
+  def __init__(self, budget: float, drempel: int = 3, hersteltijd: float = 60.0):
+    self.budget = budget
+    self.drempel = drempel
+    self.hersteltijd = hersteltijd
+    self.toestand = DICHT
+    self.fouten = 0
+    self.geopend = 0.0
+    self.slot = threading.Lock()
+
+  def toegestaan(self) -> bool:
+    """
+    Bepaalt of een aanroep naar de externe bron uitgevoerd mag worden.
+
+    Returns:
+        bool: True als de aanroep door mag gaan, False als direct teruggevallen moet worden
+    """
+    with self.slot:
+      if self.toestand == DICHT:
+        return True
+      if self.toestand == OPEN and time.monotonic() - self.geopend >= self.hersteltijd:
+        # half-open: alleen deze proefaanroep mag door tot de uitkomst bekend is
+        self.toestand = HALFOPEN
+        return True
+      return False
+
+  def registreer(self, gelukt: bool, duur: float) -> None:
+    """
+    Verwerkt de uitkomst van een aanroep.
+
+    Args:
+        gelukt: Of de aanroep een bruikbaar antwoord opleverde
+        duur: Duur van de aanroep in seconden
+    """
+    with self.slot:
+      if gelukt and duur <= self.budget:
+        self.toestand = DICHT
+        self.fouten = 0
+      else:
+        self.fouten += 1
+        if self.toestand == HALFOPEN or self.fouten >= self.drempel:
+          self.toestand = OPEN
+          self.geopend = time.monotonic()
+
+  def aanroep(self, functie: Callable, *args):
+    """
+    Voert een aanroep naar de externe bron uit en registreert de uitkomst.
+
+    Args:
+        functie: De uit te voeren aanroep
+        args: Argumenten voor de aanroep
+
+    Returns:
+        Het resultaat van de aanroep
+
+    Raises:
+        Onderbroken: Als de zekering open staat of de aanroep een fout gaf
+    """
+    if not self.toegestaan():
+      raise Onderbroken('zekering open')
+    start = time.monotonic()
+    try:
+      resultaat = functie(*args)
+    except Exception as fout:
+      self.registreer(False, time.monotonic() - start)
+      raise Onderbroken(str(fout)) from fout
+    self.registreer(True, time.monotonic() - start)
+    return resultaat
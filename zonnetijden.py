@@ -10,6 +10,7 @@ Dit module biedt functionaliteit voor:
 import datetime
 import locale
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import pytz
 import requests
@@ -20,77 +21,177 @@ from astral.sun import sun
 from cachetools import cached, TTLCache
 from flask import Flask, render_template, request
 
+import zonraster
+from toelating import Toelating, TE_DRUK, TE_GROOT, TEGOED_OP
+from zekering import Onderbroken, Zekering
+
 app = Flask(__name__)
 weerapikey = os.environ['WEER_API_KEY']
 weercache = TTLCache(maxsize=1, ttl=900)
 watercache = TTLCache(maxsize=1, ttl=7200)
 locatiecache = TTLCache(maxsize=10, ttl=86400)
+snelzon = os.environ.get('ZON_RASTER', '') == '1'
+weerzekering = Zekering(float(os.environ.get('WEERLIVE_BUDGET', '6')))
+locatiezekering = Zekering(float(os.environ.get('PDOK_BUDGET', '3')))
+waterzekering = Zekering(float(os.environ.get('WATERSTAND_BUDGET', '6')))
+waterpool = ThreadPoolExecutor(max_workers=1)
+waterlopend = []
+zontoelating = Toelating(maxkosten=int(os.environ.get('ZON_MAXKOSTEN', '1000')),
+                         capaciteit=float(os.environ.get('ZON_TEGOED', '2000')),
+                         aanvulling=float(os.environ.get('ZON_AANVULLING', '10')),
+                         duurgrens=int(os.environ.get('ZON_DUURGRENS', '366')),
+                         maxduur=int(os.environ.get('ZON_MAXDUUR', '2')))
 
 
-def leesjson(url: str) -> dict:
+def leesjson(url: str, zekering: Zekering) -> dict:
   """
   Haalt JSON-data op van een gegeven URL.
 
   Args:
       url: De URL waarvan de JSON-data opgehaald moet worden
+      zekering: De zekering van de externe bron, met het tijdsbudget als timeout
 
   Returns:
       dict: De opgehaalde JSON-data als dictionary
-      {}: Als er een fout optreedt bij het ophalen
+
+  Raises:
+      Onderbroken: Als het ophalen mislukt, de server een foutstatus geeft of de zekering open staat
   """
-  try:
-    req = requests.get(url, timeout=6, allow_redirects=False)
+  def ophalen() -> dict:
+    req = requests.get(url, timeout=zekering.budget, allow_redirects=False)
+    req.raise_for_status()
     return req.json()
-  except (requests.exceptions.InvalidURL,
-          requests.exceptions.HTTPError,
-          IOError):
-    return {}
+
+  return zekering.aanroep(ophalen)
+
+
+def haalwaterstand() -> dict:
+  """
+  Haalt de waterstand bij Zwolle op binnen het tijdsbudget van de waterzekering.
+
+  De waterstand module probeert zelf meerdere keren met pauzes; daarom loopt de
+  aanroep in een aparte thread en wordt na het budget niet langer gewacht. De
+  afgebroken aanroep loopt door; zie waterbezig().
+
+  Returns:
+      dict: De waterstand zoals de waterstand module die teruggeeft
+
+  Raises:
+      TimeoutError: Als het budget verstreken is
+      Onderbroken: Als de waterstand module geen resultaat heeft
+  """
+  aanroep = waterpool.submit(waterstand.haalwaterstand, 'zwolle.ijssel')
+  waterlopend[:] = [aanroep]
+  stand = aanroep.result(timeout=waterzekering.budget)
+  if stand['resultaat'] == 'NOK':
+    raise Onderbroken(stand.get('error', 'NOK'))
+  return stand
 
 
-def formatdate(date: datetime) -> str:
+def waterbezig() -> bool:
   """
-  Converteert een datetime object naar een datum string.
+  Bepaalt of een eerdere, na het budget afgebroken waterstandaanroep nog loopt.
+
+  Returns:
+      bool: True als de waterstand thread nog bezig is
+  """
+  return any(not aanroep.done() for aanroep in waterlopend)
+
+
+def formattimedelta(timedelta):
+  """
+  Converteert een timedelta naar een leesbare tijd string.
 
   Args:
-      date: datetime object dat geformatteerd moet worden
+      timedelta: Het tijdsverschil dat geformatteerd moet worden
 
   Returns:
-      str: Geformatteerde datum in YYYY-MM-DD formaat
+      str: Geformatteerd tijdsverschil in HH:MM:SS=formaat
   """
-  localdate = date.astimezone(pytz.timezone('Europe/Amsterdam'))
-  return datetime.datetime.strftime(localdate, '%Y-%m-%d')
+  return str(timedelta).split(".", maxsplit=1)[0]
 
 
-def formattime(date: datetime, seconds: bool = False) -> str:
+def formatseconden(seconden: float, seconds: bool = False) -> str:
   """
-  Converteert een datetime object naar een tijd string.
+  Converteert een aantal seconden sinds middernacht naar een tijd string.
 
   Args:
-      date: datetime object dat geformatteerd moet worden
+      seconden: Aantal seconden sinds middernacht
       seconds: Of seconden meegenomen moeten worden in de output
 
   Returns:
       str: Geformatteerde tijd in HH:MM- of HH:MM:SS-formaat
   """
-  localdate = date.astimezone(pytz.timezone('Europe/Amsterdam'))
+  heel = int(seconden)
+  tijd = datetime.time(heel // 3600, heel % 3600 // 60, heel % 60)
   if seconds:
     formaat = '%H:%M:%S'
   else:
     formaat = '%H:%M'
-  return datetime.datetime.strftime(localdate, formaat)
+  return tijd.strftime(formaat)
 
 
-def formattimedelta(timedelta):
+def secondenlokaal(date: datetime) -> float:
   """
-  Converteert een timedelta naar een leesbare tijd string.
+  Bepaalt het aantal seconden sinds middernacht in Nederlandse tijd.
 
   Args:
-      timedelta: Het tijdsverschil dat geformatteerd moet worden
+      date: datetime object met tijdzone
 
   Returns:
-      str: Geformatteerd tijdsverschil in HH:MM:SS=formaat
+      float: Aantal seconden sinds middernacht (Europe/Amsterdam)
   """
-  return str(timedelta).split(".", maxsplit=1)[0]
+  localdate = date.astimezone(pytz.timezone('Europe/Amsterdam'))
+  return localdate.hour * 3600 + localdate.minute * 60 + localdate.second + \
+    localdate.microsecond / 1000000
+
+
+class Zondag:
+  """
+  Compacte weergave van de zontijden van één dag.
+
+  De dag wordt bewaard als ordinaal en de tijden als seconden sinds middernacht;
+  de omzetting naar tekst gebeurt pas bij het weergeven. In templates is een
+  Zondag te gebruiken als dictionary met de sleutels uit VELDEN.
+
+  Args:
+      opkomst: Tijdstip van zonsopkomst
+      ondergang: Tijdstip van zonsondergang
+      seconds: Of tijden met seconden weergegeven moeten worden
+  """
+  __slots__ = ('dag', 'opkomst', 'ondergang', 'seconds')
+  VELDEN = ('datum', 'op', 'onder', 'daglengte')
+
+  def __init__(self, opkomst: datetime, ondergang: datetime, seconds: bool = False):
+    self.dag = opkomst.astimezone(pytz.timezone('Europe/Amsterdam')).toordinal()
+    self.opkomst = secondenlokaal(opkomst)
+    self.ondergang = secondenlokaal(ondergang)
+    self.seconds = seconds
+
+  def __getitem__(self, sleutel: str) -> str:
+    if sleutel not in self.VELDEN:
+      raise KeyError(sleutel)
+    return getattr(self, sleutel)()
+
+  def datum(self) -> str:
+    """ Geeft de datum in YYYY-MM-DD formaat """
+    return datetime.date.fromordinal(self.dag).isoformat()
+
+  def op(self) -> str:
+    """ Geeft de tijd van zonsopkomst """
+    return formatseconden(self.opkomst, self.seconds)
+
+  def onder(self) -> str:
+    """ Geeft de tijd van zonsondergang """
+    return formatseconden(self.ondergang, self.seconds)
+
+  def daglengte(self) -> str:
+    """ Geeft de daglengte in HH:MM:SS-formaat """
+    return formattimedelta(datetime.timedelta(seconds=self.ondergang - self.opkomst))
+
+  def alsdict(self) -> dict:
+    """ Geeft alle velden als dictionary met strings """
+    return {veld: self[veld] for veld in self.VELDEN}
 
 
 def berekenzonnetijden(datum: str, plaats: str, lat: float, lon: float) -> dict:
@@ -114,10 +215,13 @@ def berekenzonnetijden(datum: str, plaats: str, lat: float, lon: float) -> dict:
   return sun(city.observer, date=datetime.date(jaar, maand, dag), tzinfo=city.timezone)
 
 
-def getinfo(datum: str, plaats: str, lat: float, lon: float, seconds: bool = False) -> dict:
+def getinfo(datum: str, plaats: str, lat: float, lon: float, seconds: bool = False) -> Zondag:
   """
   Verzamelt alle zoninformatie voor een specifieke datum en locatie.
 
+  Als ZON_RASTER=1 gezet is, worden de tijden voor locaties in Nederland in
+  dit en volgend jaar uit het zonraster geïnterpoleerd in plaats van met astral berekend.
+
   Args:
       datum: Datum waarvoor de informatie opgevraagd wordt
       plaats: Naam van de plaats
@@ -126,20 +230,18 @@ def getinfo(datum: str, plaats: str, lat: float, lon: float, seconds: bool = Fal
       seconds: Of tijden met seconden weergegeven moeten worden
 
   Returns:
-      dict: Dictionary met datum, zonsopkomst, -ondergang en daglengte
+      Zondag: Datum, zonsopkomst, -ondergang en daglengte
   """
-  res = berekenzonnetijden(datum, plaats, lat, lon)
-
-  opkomst = res['sunrise']
-  onder = res['sunset']
-  result = {'datum': formatdate(opkomst),
-            'op': formattime(opkomst, seconds),
-            'onder': formattime(onder, seconds),
-            'daglengte': formattimedelta(onder - opkomst)}
-  return result
+  if snelzon and zonraster.binnenraster(datum, lat, lon):
+    opkomst, onder = zonraster.zontijden(datum, lat, lon)
+  else:
+    res = berekenzonnetijden(datum, plaats, lat, lon)
+    opkomst = res['sunrise']
+    onder = res['sunset']
+  return Zondag(opkomst, onder, seconds)
 
 
-def getinfohattem(datum: str, seconds: bool = False) -> dict:
+def getinfohattem(datum: str, seconds: bool = False) -> Zondag:
   """
   Verzamelt zoninformatie specifiek voor Hattem.
 
@@ -148,7 +250,7 @@ def getinfohattem(datum: str, seconds: bool = False) -> dict:
       seconds: Of tijden met seconden weergegeven moeten worden
 
   Returns:
-      dict: Dictionary met zoninformatie voor Hattem
+      Zondag: Zoninformatie voor Hattem
   """
   return getinfo(datum, 'Hattem', 52.479108, 6.060676, seconds)
 
@@ -179,17 +281,33 @@ def vandaagget() -> str:
   return render_template('vandaag.html', plaats='Hattem', rows=gegevens)
 
 
-@cached(weercache)
 def getweerinfo() -> dict:
   """
   Haalt de actuele informatie over het weer voor Hattem op via de weerlive.nl-API.
 
   Returns:
       dict: Dictionary met weergegevens inclusief temperatuur, windkracht en verwachting
-      None: Als er een fout optreedt bij het ophalen van de gegevens
+      dict: Lege dictionary als er een fout optreedt bij het ophalen van de gegevens
+  """
+  try:
+    return haalweerinfo()
+  except Onderbroken:
+    return {}
+
+
+@cached(weercache)
+def haalweerinfo() -> dict:
+  """
+  Haalt de weergegevens op en cachet ze voor 15 minuten; een fout wordt niet gecachet.
+
+  Returns:
+      dict: De weergegevens van weerlive.nl, of {} als weerlive een fout meldt
+
+  Raises:
+      Onderbroken: Als weerlive.nl niet bereikbaar is of de zekering open staat
   """
   url = f'https://weerlive.nl/api/weerlive_api_v2.php?key={weerapikey}&locatie=Hattem'
-  weerinfo = leesjson(url)
+  weerinfo = leesjson(url, weerzekering)
   if weerinfo == {} or \
       weerinfo.get('liveweer', None) is None or \
       weerinfo.get('liveweer')[0].get('fout') is not None:
@@ -197,20 +315,37 @@ def getweerinfo() -> dict:
   return weerinfo
 
 
-@cached(watercache)
 def getwaterinfo() -> dict:
   """
   Haalt de actuele waterstand bij het Katerveer in Zwolle op.
 
-  De gegevens worden opgehaald uit de waterstand module en gecachet voor 2 uur.
-
   Returns:
       dict: Dictionary met huidige en voorspelde waterstand voor morgen
-      dict: Lege dictionary als er een fout optreedt
+      dict: Lege dictionary als er een fout optreedt of de zekering open staat
   """
-  stand = waterstand.haalwaterstand('zwolle.ijssel')
-  if stand['resultaat'] == 'NOK':
+  try:
+    return haalwaterinfo()
+  except Onderbroken:
     return {}
+
+
+@cached(watercache)
+def haalwaterinfo() -> dict:
+  """
+  Haalt de waterstand op uit de waterstand module en cachet die voor 2 uur.
+
+  Een fout wordt niet gecachet, zodat een volgende aanvraag het opnieuw probeert.
+
+  Returns:
+      dict: Dictionary met huidige en voorspelde waterstand voor morgen
+
+  Raises:
+      Onderbroken: Als er een fout optreedt, de zekering open staat of een eerdere aanroep nog loopt
+  """
+  if waterbezig():
+    # niet achter een hangende aanroep wachten; dat zou het budget van deze aanroep opeten
+    raise Onderbroken('vorige waterstandaanroep loopt nog')
+  stand = waterzekering.aanroep(haalwaterstand)
   hoogtenu = int(stand['nu'])
   hoogtemorgen = int(stand['morgen'])
   if hoogtenu == -999:
@@ -223,7 +358,6 @@ def getwaterinfo() -> dict:
   return result
 
 
-@cached(locatiecache)
 def getlocatieinfo(plaatsnaam: str) -> dict:
   """
   Haalt locatiegegevens op voor een opgegeven plaatsnaam.
@@ -233,10 +367,30 @@ def getlocatieinfo(plaatsnaam: str) -> dict:
 
   Returns:
       dict: Dictionary met latitude en longitude coördinaten
-      None: Als er geen locatie gevonden kan worden
+      dict: Lege dictionary als er geen locatie gevonden kan worden
+  """
+  try:
+    return haallocatieinfo(plaatsnaam)
+  except Onderbroken:
+    return {}
+
+
+@cached(locatiecache)
+def haallocatieinfo(plaatsnaam: str) -> dict:
+  """
+  Haalt locatiegegevens op bij PDOK en cachet ze voor 24 uur; een fout wordt niet gecachet.
+
+  Args:
+      plaatsnaam: Naam van de plaats of postcode waarvoor de coördinaten opgevraagd worden
+
+  Returns:
+      dict: Dictionary met latitude en longitude coördinaten, of {} als de plaats niet bestaat
+
+  Raises:
+      Onderbroken: Als PDOK niet bereikbaar is of de zekering open staat
   """
   url = f'https://api.pdok.nl/bzk/locatieserver/search/v3_1/free?q={plaatsnaam}'
-  locatieinfo = leesjson(url)
+  locatieinfo = leesjson(url, locatiezekering)
   if locatieinfo == {} or \
       locatieinfo.get('response', None) is None or \
       int(locatieinfo.get('response').get('numFound', 0)) == 0:
@@ -398,8 +552,8 @@ def weerget() -> str:
   """ Genereer de pagina met het weer en de zon van vandaag in Hattem """
   locale.setlocale(locale.LC_TIME, 'nl_NL.UTF-8')
   vandaag = datetime.date.today()
-  gegevens = getinfohattem(str(vandaag))
-  gegevens = gegevens | getweergegevens()
+  zon = getinfohattem(str(vandaag))
+  gegevens = getweergegevens()
   waterinfo = getwaterinfo()
   if not waterinfo:
     stand = '-'
@@ -418,11 +572,11 @@ def weerget() -> str:
   gegevens['waterstandmorgen'] = waterstandmorgen
   gegevens['waterkleur1'] = waterkleur1
   gegevens['waterkleur2'] = waterkleur2
-  return render_template('weer.html', plaats='Hattem', gegevens=gegevens)
+  return render_template('weer.html', plaats='Hattem', gegevens=gegevens, zon=zon)
 
 
 @app.route('/zon', methods=['GET'])
-def zonget() -> str:
+def zonget() -> str | tuple:
   """
   Genereert een overzicht van zontijden voor een opgegeven plaats en periode.
 
@@ -433,8 +587,9 @@ def zonget() -> str:
 
   Returns:
       str: HTML-pagina met zontijden voor de opgegeven periode
+      tuple: Foutmelding met status 413, of met status 429 en een Retry-After-header,
+      als de aanvraag niet toegelaten wordt
   """
-  gegevens = []
   plaats = request.args.get('plaats')
   argterug = request.args.get('terug')
   argvooruit = request.args.get('vooruit')
@@ -456,6 +611,36 @@ def zonget() -> str:
     argvooruit = '50'
   vooruit = int(argvooruit)
 
+  # kosten: aantal rijen maal aantal locaties, per aanvraag is dat één locatie
+  kosten = max(0, vooruit - terug)
+  reden, wachttijd = zontoelating.toelaten(request.remote_addr, kosten)
+  if reden == TE_GROOT:
+    return f'Aanvraag van {kosten} dagen is te groot, maximaal {zontoelating.maxkosten} dagen', 413
+  if reden == TEGOED_OP:
+    return (f'Te veel aanvragen, probeer het over {wachttijd} seconden opnieuw', 429,
+            {'Retry-After': str(wachttijd)})
+  if reden == TE_DRUK:
+    return (f'Te veel grote aanvragen tegelijk, probeer het over {wachttijd} seconden opnieuw', 429,
+            {'Retry-After': str(wachttijd)})
+  try:
+    return zonpagina(plaats, terug, vooruit)
+  finally:
+    zontoelating.vrijgeven(kosten)
+
+
+def zonpagina(plaats: str, terug: int, vooruit: int) -> str:
+  """
+  Genereert de pagina met zontijden voor een plaats en een toegelaten periode.
+
+  Args:
+      plaats: Naam van de plaats
+      terug: Eerste dag ten opzichte van vandaag (negatief voor dagen terug)
+      vooruit: Aantal dagen vooruit
+
+  Returns:
+      str: HTML-pagina met zontijden voor de opgegeven periode
+  """
+  gegevens = []
   plaatsgegevens = getlocatieinfo(plaats)
   if plaatsgegevens:
     lat = plaatsgegevens['lat']
@@ -472,5 +657,13 @@ def zonget() -> str:
   return render_template('vandaag.html', plaats=plaats, rows=gegevens)
 
 
+@app.route('/teller', methods=['GET'])
+def tellerget() -> dict:
+  """ Geeft de tellers van de toelatingscontrole voor /zon terug """
+  return dict(zontoelating.teller)
+
+
 if __name__ == '__main__':
+  if snelzon:
+    zonraster.bouwrasters([datetime.date.today().year, datetime.date.today().year + 1])
   waitress.serve(app, host="0.0.0.0", port=8083)
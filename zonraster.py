@@ -0,0 +1,137 @@
+"""
+Module voor het snel benaderen van zonsopkomst en -ondergang in Nederland.
+
+Per jaar wordt één keer een raster (breedtegraad x lengtegraad x dag van het jaar)
+met de tijden van zonsopkomst en -ondergang over Nederland berekend. Daarna
+worden de tijden voor een willekeurige locatie binnen het raster bilineair
+geïnterpoleerd, zonder astral aan te roepen. Alleen jaren waarvoor het raster
+vooraf met bouwrasters() berekend is, worden zo benaderd; voor andere jaren
+geeft binnenraster() False en rekent de aanroeper met astral.
+
+De fout van de interpolatie is kleiner dan MAXFOUT seconden; gemeten is
+ongeveer 0,6 seconde. Met valideerraster.py kan de fout opnieuw gemeten worden.
+"""
+import datetime
+
+import numpy
+from astral import Observer
+from astral.sun import sunrise, sunset
+
+ZUID = 50.7
+NOORD = 53.6
+WEST = 3.3
+OOST = 7.3
+BREEDTEGRADEN = numpy.linspace(ZUID, NOORD, 8)
+LENGTEGRADEN = numpy.linspace(WEST, OOST, 5)
+MAXFOUT = 5
+rasters = {}
+
+
+def binnenraster(datum: str, lat: float, lon: float) -> bool:
+  """
+  Bepaalt of een datum en locatie binnen een vooraf berekend raster vallen.
+
+  Args:
+      datum: Datum waarvoor de tijden bepaald worden (YYYY-MM-DD)
+      lat: Breedtegraad van de locatie
+      lon: Lengtegraad van de locatie
+
+  Returns:
+      bool: True als de tijden uit het raster gehaald kunnen worden
+  """
+  return int(datum[0:4]) in rasters and ZUID <= lat <= NOORD and WEST <= lon <= OOST
+
+
+def secondenutc(tijd: datetime.datetime, datum: datetime.date) -> float:
+  """
+  Berekent het aantal seconden sinds middernacht UTC van een datum.
+
+  Args:
+      tijd: Tijdstip met tijdzone
+      datum: Datum vanaf wiens middernacht (UTC) geteld wordt
+
+  Returns:
+      float: Aantal seconden sinds middernacht UTC
+  """
+  middernacht = datetime.datetime(datum.year, datum.month, datum.day, tzinfo=datetime.timezone.utc)
+  return (tijd - middernacht).total_seconds()
+
+
+def bouwrasters(jaren: list[int]) -> None:
+  """
+  Berekent de rasters voor de opgegeven jaren, voor zover ze nog niet bestaan.
+
+  Bedoeld om bij het starten aan te roepen; een raster kost ongeveer 0,8 seconde.
+
+  Args:
+      jaren: De jaren waarvoor een raster berekend wordt
+  """
+  for jaar in jaren:
+    if jaar not in rasters:
+      rasters[jaar] = bouwraster(jaar)
+
+
+def bouwraster(jaar: int) -> numpy.ndarray:
+  """
+  Berekent het raster met zonsopkomst en -ondergang voor een jaar.
+
+  Args:
+      jaar: Het jaar waarvoor het raster berekend wordt
+
+  Returns:
+      numpy.ndarray: float32-array (opkomst/ondergang x breedte x lengte x dag)
+      met seconden sinds middernacht UTC
+  """
+  eerstedag = datetime.date(jaar, 1, 1)
+  dagen = (datetime.date(jaar + 1, 1, 1) - eerstedag).days
+  raster = numpy.empty((2, len(BREEDTEGRADEN), len(LENGTEGRADEN), dagen), dtype=numpy.float32)
+  for i, lat in enumerate(BREEDTEGRADEN):
+    for j, lon in enumerate(LENGTEGRADEN):
+      observer = Observer(float(lat), float(lon))
+      for dag in range(dagen):
+        datum = eerstedag + datetime.timedelta(dag)
+        raster[0, i, j, dag] = secondenutc(sunrise(observer, datum), datum)
+        raster[1, i, j, dag] = secondenutc(sunset(observer, datum), datum)
+  return raster
+
+
+def rasterpositie(waarde: float, punten: numpy.ndarray) -> tuple[int, float]:
+  """
+  Bepaalt de rastercel en de relatieve positie daarin voor één as.
+
+  Args:
+      waarde: De coördinaat op de as
+      punten: De rasterpunten op de as
+
+  Returns:
+      tuple: Index van het onderste rasterpunt en de fractie richting het volgende punt
+  """
+  positie = (waarde - punten[0]) / (punten[1] - punten[0])
+  index = min(int(positie), len(punten) - 2)
+  return index, positie - index
+
+
+def zontijden(datum: str, lat: float, lon: float) -> tuple[datetime.datetime, datetime.datetime]:
+  """
+  Benadert zonsopkomst en -ondergang voor een datum en locatie binnen het raster.
+
+  Alleen aan te roepen als binnenraster() True geeft.
+
+  Args:
+      datum: Datum waarvoor de tijden bepaald worden (YYYY-MM-DD)
+      lat: Breedtegraad van de locatie
+      lon: Lengtegraad van de locatie
+
+  Returns:
+      tuple: Zonsopkomst en -ondergang als datetime in UTC
+  """
+  dag = datetime.date.fromisoformat(datum)
+  raster = rasters[dag.year]
+  i, fi = rasterpositie(lat, BREEDTEGRADEN)
+  j, fj = rasterpositie(lon, LENGTEGRADEN)
+  cel = raster[:, i:i + 2, j:j + 2, dag.timetuple().tm_yday - 1].astype(numpy.float64)
+  gewichten = numpy.outer([1 - fi, fi], [1 - fj, fj])
+  opkomst, onder = (cel * gewichten).sum(axis=(1, 2))
+  middernacht = datetime.datetime(dag.year, dag.month, dag.day, tzinfo=datetime.timezone.utc)
+  return (middernacht + datetime.timedelta(seconds=float(opkomst)),
+          middernacht + datetime.timedelta(seconds=float(onder)))